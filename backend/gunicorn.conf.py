@@ -0,0 +1,24 @@
+"""
+Gunicorn settings for the Car Simulator Backend Server
+
+Run from the backend directory with: gunicorn server:app
+"""
+
+import os
+
+bind = "0.0.0.0:5000"
+
+# gevent workers overlap the slow Nominatim/OSRM calls with /update traffic
+worker_class = "gevent"
+worker_connections = 1000
+timeout = 30
+
+# Session state lives in each worker process, so more than one worker is
+# only safe behind a load balancer that pins a session to one worker
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+
+
+def post_worker_init(worker):
+    """Start the physics ticker in each worker once the app is loaded"""
+    import server
+    server.start_physics_ticker()
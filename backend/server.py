@@ -3,18 +3,104 @@ Car Simulator Backend Server
 Handles physics calculations and route management using OpenStreetMap APIs
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request
 from flask_cors import CORS
+from cachetools import TTLCache
+import functools
+import inspect
 import math
+import numpy as np
+import msgspec
+import orjson
+from numba import njit
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dataclasses import dataclass, asdict
-from typing import Optional, Dict, Any, List, Tuple
+from typing import (
+    Optional, Dict, Any, List, Tuple, Callable, Literal, Type, TypeVar, get_args
+)
+import threading
 import time
 
 app = Flask(__name__)
 CORS(app)
 
-@dataclass
+
+Msg = TypeVar('Msg', bound=msgspec.Struct)
+
+
+def parse_body(msg_type: Type[Msg], default_empty: bool = False) -> Msg:
+    """
+    Decode the raw request body straight into a msgspec struct
+
+    An empty body is rejected unless default_empty is set, in which case
+    it decodes as {} (every field at its default).
+    """
+    body = request.stream.read(request.content_length or -1)
+    if not body and default_empty:
+        body = b"{}"
+    return msgspec.json.decode(body, type=msg_type)
+
+
+def ojson(obj: Any, status: int = 200) -> Response:
+    """Serialize obj with orjson into a JSON response (NumPy arrays allowed)"""
+    return app.response_class(
+        orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype="application/json"
+    )
+
+# Physics constants
+MAX_SPEED_PER_GEAR = {
+    'N': 0,
+    'R': 30,
+    '1': 40,
+    '2': 80,
+    '3': 120,
+    '4': 160,
+    '5': 200
+}
+
+ACCELERATION = 5  # km/h per second at full throttle
+BRAKE_FORCE = 15  # km/h per second at full brake
+ENGINE_BRAKE = 2  # km/h per second natural deceleration
+TURN_RATE = 45  # degrees per second at max steering
+MAX_RPM = 8000
+IDLE_RPM = 800
+
+# Earth constants for coordinate calculations
+METERS_PER_DEGREE_LAT = 111320
+_INV_MPD_LAT = 1.0 / METERS_PER_DEGREE_LAT
+
+# Latitude quantization for the cached meters-per-degree-longitude factor
+LAT_KEY_SCALE = 1e4  # 4 decimals, ~11 m
+LAT_KEY_UNSET = np.iinfo(np.int64).min
+
+# Valid gears; integer gear codes are their positions so the physics
+# kernel never compares strings
+Gear = Literal['N', 'R', '1', '2', '3', '4', '5']
+GEAR_NAMES: Tuple[Gear, ...] = get_args(Gear)
+GEAR_CODES = {name: code for code, name in enumerate(GEAR_NAMES)}
+GEAR_NEUTRAL = GEAR_CODES['N']
+GEAR_REVERSE = GEAR_CODES['R']
+
+# Top speed per gear code, indexed by the kernel instead of hashing gear names
+MAX_SPEED_ARR = np.array([MAX_SPEED_PER_GEAR[g] for g in GEAR_NAMES], dtype=np.float32)
+
+# Field layout of SessionTable.pos, float64 to keep geographic precision
+POS_DTYPE = np.float64
+LAT, LNG = range(2)
+N_POS = 2
+
+# Field layout of SessionTable.dyn; km/h, degrees and pedal percentages
+# need no more than float32, which halves the memory the tick streams
+DYN_DTYPE = np.float32
+HEAD, SPEED, RPM, STEER, CLUTCH, BRAKE, ACCEL = range(7)
+N_DYN = 7
+
+
+@dataclass(slots=True)
 class CarState:
     """Represents the current state of the car"""
     lat: float = 12.9716  # Bangalore default
@@ -22,146 +108,454 @@ class CarState:
     heading: float = 0  # degrees (0 = North)
     speed: float = 0  # km/h
     rpm: float = 0
-    gear: str = 'N'
+    gear: Gear = 'N'
     engine_on: bool = False
     steering_angle: float = 0  # -540 to 540 degrees
     clutch: float = 0  # 0-100%
     brake: float = 0  # 0-100%
     accelerator: float = 0  # 0-100%
 
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Pack the numeric fields into POS_DTYPE and DYN_DTYPE arrays"""
+        pos = np.array([self.lat, self.lng], dtype=POS_DTYPE)
+        dyn = np.array([
+            self.heading, self.speed, self.rpm, self.steering_angle,
+            self.clutch, self.brake, self.accelerator
+        ], dtype=DYN_DTYPE)
+        return pos, dyn
 
-class PhysicsEngine:
-    """Handles all physics calculations for the car"""
-    
-    # Physics constants
-    MAX_SPEED_PER_GEAR = {
-        'N': 0,
-        'R': 30,
-        '1': 40,
-        '2': 80,
-        '3': 120,
-        '4': 160,
-        '5': 200
-    }
-    
-    ACCELERATION = 5  # km/h per second at full throttle
-    BRAKE_FORCE = 15  # km/h per second at full brake
-    ENGINE_BRAKE = 2  # km/h per second natural deceleration
-    TURN_RATE = 45  # degrees per second at max steering
-    MAX_RPM = 8000
-    IDLE_RPM = 800
-    
-    # Earth constants for coordinate calculations
-    METERS_PER_DEGREE_LAT = 111320
+    def from_arrays(self, pos: np.ndarray, dyn: np.ndarray) -> 'CarState':
+        """Unpack position and dynamics arrays back into this CarState"""
+        self.lat, self.lng = pos.tolist()
+        # Dynamics stay np.float32 scalars so ojson prints their shortest
+        # float32 form (12.3) instead of the widened double (12.30000019)
+        (self.heading, self.speed, self.rpm, self.steering_angle,
+         self.clutch, self.brake, self.accelerator) = dyn
+        return self
+
+
+class Position(msgspec.Struct):
+    """A lat/lng pair as sent by the frontend"""
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+
+
+class UpdateMsg(msgspec.Struct):
+    """Body of an /update request; omitted fields keep their stored value"""
+    session_id: str = 'default'
+    position: Optional[Position] = None
+    heading: Optional[float] = None
+    speed: Optional[float] = None
+    gear: Optional[Gear] = None
+    engine_on: Optional[bool] = msgspec.field(default=None, name='engineOn')
+    steering_angle: Optional[float] = msgspec.field(default=None, name='steeringAngle')
+    clutch: Optional[float] = None
+    brake: Optional[float] = None
+    accelerator: Optional[float] = None
+
+
+class GeocodeMsg(msgspec.Struct):
+    """Body of a /geocode request"""
+    address: str = ''
+
+
+class ReverseGeocodeMsg(msgspec.Struct):
+    """Body of a /reverse-geocode request"""
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+
+
+class RouteMsg(msgspec.Struct):
+    """Body of a /route request"""
+    start: Position = msgspec.field(default_factory=Position)
+    end: Position = msgspec.field(default_factory=Position)
+
+
+class DistanceMsg(msgspec.Struct):
+    """Body of a /distance request"""
+    from_point: Position = msgspec.field(default_factory=Position, name='from')
+    to_point: Position = msgspec.field(default_factory=Position, name='to')
+
+
+class Positions(msgspec.Struct):
+    """Parallel lat/lng arrays"""
+    lat: Optional[List[float]] = None
+    lng: Optional[List[float]] = None
+
+
+class DistanceBatchMsg(msgspec.Struct):
+    """Body of a /distance/batch request"""
+    from_points: Positions = msgspec.field(default_factory=Positions, name='from')
+    to_points: Positions = msgspec.field(default_factory=Positions, name='to')
+
+
+class ResetMsg(msgspec.Struct):
+    """Body of a /reset request; every field is optional"""
+    session_id: str = 'default'
+    lat: float = 12.9716
+    lng: float = 77.5946
+
+
+# UpdateMsg driver inputs copied onto CarState under the same name
+INPUT_FIELDS = (
+    'gear', 'engine_on', 'steering_angle', 'clutch', 'brake', 'accelerator'
+)
+
+# UpdateMsg motion fields that only seed a new or relocated session;
+# otherwise the physics ticker owns them
+SEED_FIELDS = ('heading', 'speed')
+
+
+@njit(cache=True, fastmath=True)
+def _step_table(pos, dyn, gear_code, engine_on, lat_key, inv_mpd_lng, dt):
+    """
+    Advance every session in a SessionTable by dt seconds in one pass
+
+    Args:
+        pos: (N_POS, n) POS_DTYPE block laid out as LAT, LNG
+        dyn: (N_DYN, n) DYN_DTYPE block laid out as HEAD..ACCEL
+        gear_code: Selected gear of each row as a GEAR_CODES value
+        engine_on: Whether each row's engine is running
+        lat_key: Quantized latitude inv_mpd_lng was last computed for
+        inv_mpd_lng: Cached 1 / meters per degree of longitude per row
+        dt: Time elapsed since last step in seconds
+    """
+    # float32 literals and constants keep the DYN_DTYPE arithmetic in
+    # single precision; a bare Python float or int would promote to float64
+    f32 = np.float32
+    zero = f32(0.0)
+    one = f32(1.0)
+    half = f32(0.5)
+    percent = f32(0.01)
+    dt = f32(dt)
+
+    speed = dyn[SPEED]
+    throttle = dyn[ACCEL] * percent
+    brake = dyn[BRAKE] * percent
+    clutch = dyn[CLUTCH]
+    neutral = gear_code == GEAR_NEUTRAL
+    reverse = gear_code == GEAR_REVERSE
+
+    max_speed = MAX_SPEED_ARR[gear_code]
+    has_top = max_speed > 0
+    speed_ratio = np.where(has_top, speed / np.where(has_top, max_speed, one), zero)
+
+    # Acceleration and braking only apply in gear with the clutch released
+    driving = engine_on & ~neutral & (clutch < 50)
+    accel = f32(ACCELERATION) * throttle * (one - speed_ratio * half)
+    accelerating = driving & (throttle > 0) & (speed < max_speed)
+    top = np.where(reverse, f32(30.0), max_speed)
+    speed = np.where(accelerating, np.minimum(top, speed + accel * dt), speed)
+    braking = driving & (brake > 0)
+    speed = np.where(
+        braking, np.maximum(zero, speed - f32(BRAKE_FORCE) * brake * dt), speed
+    )
+
+    # Engine braking: off, coasting in gear, or in neutral/clutch pressed
+    engine_brake = f32(ENGINE_BRAKE)
+    coasting = driving & (throttle == 0) & (brake == 0)
+    drag = np.where(
+        engine_on,
+        np.where(driving, np.where(coasting, engine_brake, zero), engine_brake * half),
+        engine_brake
+    )
+    speed = np.where(drag > 0, np.maximum(zero, speed - drag * dt), speed)
+
+    # Calculate RPM
+    idle_rpm = f32(IDLE_RPM)
+    rpm_range = f32(MAX_RPM - IDLE_RPM)
+    rpm = np.where(
+        clutch > 50,
+        idle_rpm + throttle * rpm_range,
+        np.where(
+            neutral,
+            idle_rpm + throttle * f32(3000),
+            idle_rpm + speed_ratio * rpm_range
+        )
+    )
+    dyn[RPM] = np.where(engine_on, rpm, zero)
+    dyn[SPEED] = speed
+
+    # Position: only rows that are actually moving
+    speed = dyn[SPEED]
+    lat = pos[LAT]
+    lng = pos[LNG]
+    heading = dyn[HEAD]
+    steering = dyn[STEER]
+    for i in range(speed.shape[0]):
+        if speed[i] < f32(0.1):
+            continue
+
+        # Calculate turn rate based on steering angle and speed
+        steering_factor = steering[i] * f32(1 / 540)  # Normalize to -1 to 1
+        speed_factor = min(one, speed[i] * f32(1 / 50))  # Less turning at high speed
+        turn = f32(TURN_RATE) * steering_factor * speed_factor * dt
+
+        # Update heading and normalize to 0-360
+        h = heading[i] - turn if reverse[i] else heading[i] + turn
+        h -= f32(360.0) * np.floor(h * f32(1 / 360))
+        heading[i] = h
+
+        # Calculate movement, reversed for reverse gear
+        distance = speed[i] * f32(1000 / 3600) * dt  # Distance in meters
+        if reverse[i]:
+            distance = -distance
+
+        # sin and cos of the same angle side by side lower to one sincos call
+        heading_rad = (h - f32(90)) * f32(math.pi / 180)  # Adjust for map coords
+        sin_h = math.sin(heading_rad)
+        cos_h = math.cos(heading_rad)
+
+        # Refresh the longitude scale only once latitude has drifted
+        key = np.int64(round(lat[i] * LAT_KEY_SCALE))
+        if key != lat_key[i]:
+            lat_key[i] = key
+            inv_mpd_lng[i] = 1.0 / (
+                METERS_PER_DEGREE_LAT * math.cos(math.radians(lat[i]))
+            )
+
+        # Convert distance to lat/lng delta
+        lat_delta = distance * cos_h * _INV_MPD_LAT
+        lng_delta = distance * sin_h * inv_mpd_lng[i]
+        lat[i] += lat_delta
+        lng[i] += lng_delta
+
+
+class SessionTable:
+    """
+    Structure-of-arrays storage for the car state of every session
+
+    Each numeric CarState field lives in its own contiguous array so a
+    single vectorized step advances all sessions at once.
+    """
+
+    INITIAL_CAPACITY = 64
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self._rows: Dict[str, int] = {}
+        self.lock = threading.RLock()
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        """(Re)allocate the column arrays, keeping existing rows"""
+        n = len(self._rows)
+        pos = np.zeros((N_POS, capacity), dtype=POS_DTYPE)
+        dyn = np.zeros((N_DYN, capacity), dtype=DYN_DTYPE)
+        gear_code = np.zeros(capacity, dtype=np.int8)
+        engine_on = np.zeros(capacity, dtype=np.bool_)
+        lat_key = np.full(capacity, LAT_KEY_UNSET, dtype=np.int64)
+        inv_mpd_lng = np.zeros(capacity, dtype=np.float64)
+        if n:
+            pos[:, :n] = self.pos[:, :n]
+            dyn[:, :n] = self.dyn[:, :n]
+            gear_code[:n] = self.gear_code[:n]
+            engine_on[:n] = self.engine_on[:n]
+            lat_key[:n] = self.lat_key[:n]
+            inv_mpd_lng[:n] = self.inv_mpd_lng[:n]
+        self.pos = pos
+        self.dyn = dyn
+        self.gear_code = gear_code
+        self.engine_on = engine_on
+        self.lat_key = lat_key
+        self.inv_mpd_lng = inv_mpd_lng
+
+    def write(self, session_id: str, state: CarState) -> None:
+        """Store a CarState into the session's row, creating it if needed"""
+        with self.lock:
+            row = self._rows.get(session_id)
+            if row is None:
+                row = len(self._rows)
+                if row == self.pos.shape[1]:
+                    self._allocate(row * 2)
+                self._rows[session_id] = row
+
+            # Only a moved latitude invalidates the cached longitude scale;
+            # new rows start out unset from _allocate
+            if self.pos[LAT, row] != state.lat:
+                self.lat_key[row] = LAT_KEY_UNSET
+
+            self.pos[:, row], self.dyn[:, row] = state.to_arrays()
+            self.gear_code[row] = GEAR_CODES[state.gear]
+            self.engine_on[row] = state.engine_on
+
+    def read(self, session_id: str) -> Optional[CarState]:
+        """Return a CarState snapshot of the session's row, or None"""
+        with self.lock:
+            row = self._rows.get(session_id)
+            if row is None:
+                return None
+            state = CarState(
+                gear=GEAR_NAMES[self.gear_code[row]],
+                engine_on=bool(self.engine_on[row])
+            )
+            return state.from_arrays(self.pos[:, row], self.dyn[:, row])
+
+    def step(self, dt: float) -> None:
+        """Advance every session by dt seconds, skipping parked ones"""
+        with self.lock:
+            n = len(self._rows)
+
+            # Parked rows (engine off, fully stopped) cannot change
+            active = np.flatnonzero(self.engine_on[:n] | (self.dyn[SPEED, :n] > 0))
+            if active.size == 0:
+                return
+
+            if active.size == n:
+                _step_table(
+                    self.pos[:, :n],
+                    self.dyn[:, :n],
+                    self.gear_code[:n],
+                    self.engine_on[:n],
+                    self.lat_key[:n],
+                    self.inv_mpd_lng[:n],
+                    dt
+                )
+                return
+
+            # Step a compacted copy of the active rows and scatter it back
+            pos = self.pos[:, active]
+            dyn = self.dyn[:, active]
+            lat_key = self.lat_key[active]
+            inv_mpd_lng = self.inv_mpd_lng[active]
+            _step_table(
+                pos,
+                dyn,
+                self.gear_code[active],
+                self.engine_on[active],
+                lat_key,
+                inv_mpd_lng,
+                dt
+            )
+            self.pos[:, active] = pos
+            self.dyn[:, active] = dyn
+            self.lat_key[active] = lat_key
+            self.inv_mpd_lng[active] = inv_mpd_lng
+
+
+def _warm_up_kernel() -> None:
+    """
+    Compile (or load from cache) _step_table before the first tick
+
+    The kernel only runs for active rows, so this warms both the compacted
+    and the all-active paths (the latter on a partly filled, non-contiguous
+    table).
+    """
+    table = SessionTable(4)
+    table.write('parked', CarState())
+    table.write('running', CarState(engine_on=True))
+    table.step(0.0)
+    table.write('parked', CarState(engine_on=True))
+    table.step(0.0)
+
+
+class NominatimPlace(msgspec.Struct):
+    """A Nominatim /search result (coordinates arrive as strings)"""
+    lat: str
+    lon: str
+
+
+class NominatimAddress(msgspec.Struct):
+    """A Nominatim /reverse result"""
+    display_name: Optional[str] = None
+
+
+class OSRMManeuver(msgspec.Struct):
+    """The maneuver of an OSRM route step"""
+    instruction: str = ""
+
+
+class OSRMStep(msgspec.Struct):
+    """A single OSRM route step"""
+    maneuver: OSRMManeuver = msgspec.field(default_factory=OSRMManeuver)
+    distance: float = 0.0
+    duration: float = 0.0
+
+
+class OSRMLeg(msgspec.Struct):
+    """An OSRM route leg between two waypoints"""
+    steps: List[OSRMStep] = []
+
+
+class OSRMGeometry(msgspec.Struct):
+    """A GeoJSON line string of [lng, lat] pairs"""
+    coordinates: List[Tuple[float, float]]
+
+
+class OSRMRoute(msgspec.Struct):
+    """An OSRM route with geometry, distance (m) and duration (s)"""
+    geometry: OSRMGeometry
+    distance: float
+    duration: float
+    legs: List[OSRMLeg] = []
+
+
+class OSRMResponse(msgspec.Struct):
+    """Body of an OSRM /route response"""
+    routes: List[OSRMRoute] = []
+
+
+def _http_session() -> requests.Session:
+    """Create a keep-alive session with pooled connections for upstream APIs"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(total=2, backoff_factor=0.1)
+    ))
+    session.headers["User-Agent"] = "CarSimulator/1.0"
+    return session
+
+
+def _ttl_cached(
+    key: Callable[..., Any],
+    maxsize: int = 10_000,
+    ttl: float = 86400
+) -> Callable:
+    """
+    Memoize a RouteManager lookup in a thread-safe TTL cache
     
-    @classmethod
-    def meters_per_degree_lng(cls, lat: float) -> float:
-        """Calculate meters per degree of longitude at a given latitude"""
-        return cls.METERS_PER_DEGREE_LAT * math.cos(math.radians(lat))
+    Args:
+        key: Builds the cache key from the lookup's arguments
+        maxsize: Maximum number of cached results
+        ttl: Seconds a result stays cached
+        
+    Failed lookups (None) are not cached so they are retried next time.
+    Cached results are shared between callers and must not be mutated.
+    """
+    cache = TTLCache(maxsize=maxsize, ttl=ttl)
+    lock = threading.RLock()
     
-    @classmethod
-    def update_physics(cls, state: CarState, delta_time: float) -> CarState:
-        """
-        Update car physics based on current state and time elapsed
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
         
-        Args:
-            state: Current car state
-            delta_time: Time elapsed since last update in seconds
-            
-        Returns:
-            Updated car state
-        """
-        if not state.engine_on:
-            # Engine off - car decelerates
-            state.speed = max(0, state.speed - cls.ENGINE_BRAKE * delta_time)
-            state.rpm = 0
-            return state
-        
-        max_speed_for_gear = cls.MAX_SPEED_PER_GEAR.get(state.gear, 0)
-        speed_ratio = state.speed / max_speed_for_gear if max_speed_for_gear > 0 else 0
-        
-        # Handle acceleration and braking
-        if state.gear != 'N' and state.clutch < 50:
-            throttle = state.accelerator / 100
-            brake = state.brake / 100
-            
-            # Acceleration
-            if throttle > 0 and state.speed < max_speed_for_gear:
-                accel = cls.ACCELERATION * throttle * (1 - speed_ratio * 0.5)
-                if state.gear == 'R':
-                    state.speed = min(30, state.speed + accel * delta_time)
-                else:
-                    state.speed = min(max_speed_for_gear, state.speed + accel * delta_time)
+        @functools.wraps(func)
+        def wrapper(cls, *args, **kwargs):
+            # Bind to the signature so keyword and positional calls share a key
+            bound = signature.bind(cls, *args, **kwargs)
+            bound.apply_defaults()
+            call_args = bound.args[1:]
             
-            # Braking
-            if brake > 0:
-                brake_force = cls.BRAKE_FORCE * brake
-                state.speed = max(0, state.speed - brake_force * delta_time)
+            cache_key = key(*call_args)
+            with lock:
+                result = cache.get(cache_key)
+            if result is not None:
+                return result
             
-            # Engine braking
-            if throttle == 0 and brake == 0:
-                state.speed = max(0, state.speed - cls.ENGINE_BRAKE * delta_time)
-        else:
-            # In neutral or clutch pressed
-            state.speed = max(0, state.speed - cls.ENGINE_BRAKE * 0.5 * delta_time)
-        
-        # Calculate RPM
-        if state.clutch > 50:
-            state.rpm = cls.IDLE_RPM + (state.accelerator / 100) * (cls.MAX_RPM - cls.IDLE_RPM)
-        elif state.gear == 'N':
-            state.rpm = cls.IDLE_RPM + (state.accelerator / 100) * 3000
-        else:
-            state.rpm = cls.IDLE_RPM + speed_ratio * (cls.MAX_RPM - cls.IDLE_RPM)
+            result = func(cls, *call_args)
+            if result is not None:
+                with lock:
+                    cache[cache_key] = result
+            return result
         
-        return state
+        wrapper.cache = cache
+        return wrapper
     
-    @classmethod
-    def update_position(cls, state: CarState, delta_time: float) -> CarState:
-        """
-        Update car position based on speed and steering
-        
-        Args:
-            state: Current car state
-            delta_time: Time elapsed since last update in seconds
-            
-        Returns:
-            Updated car state with new position
-        """
-        if state.speed < 0.1:
-            return state
-        
-        # Calculate turn rate based on steering angle and speed
-        steering_factor = state.steering_angle / 540  # Normalize to -1 to 1
-        speed_factor = min(1, state.speed / 50)  # Less turning at high speed
-        turn_rate = cls.TURN_RATE * steering_factor * speed_factor
-        
-        # Update heading
-        if state.gear == 'R':
-            state.heading -= turn_rate * delta_time
-        else:
-            state.heading += turn_rate * delta_time
-        
-        # Normalize heading to 0-360
-        state.heading = ((state.heading % 360) + 360) % 360
-        
-        # Calculate movement
-        heading_rad = math.radians(state.heading - 90)  # Adjust for map coords
-        speed_ms = (state.speed * 1000) / 3600  # Convert km/h to m/s
-        distance = speed_ms * delta_time  # Distance in meters
-        
-        # Convert distance to lat/lng delta
-        lat_delta = (distance * math.cos(heading_rad)) / cls.METERS_PER_DEGREE_LAT
-        lng_delta = (distance * math.sin(heading_rad)) / cls.meters_per_degree_lng(state.lat)
-        
-        # Reverse direction for reverse gear
-        if state.gear == 'R':
-            lat_delta = -lat_delta
-            lng_delta = -lng_delta
-        
-        state.lat += lat_delta
-        state.lng += lng_delta
-        
-        return state
+    return decorator
+
+
+def _round_coords(*coords: float) -> Tuple[float, ...]:
+    """Quantize coordinates to ~1 m so near-identical queries share a key"""
+    return tuple(round(c, 5) for c in coords)
 
 
 class RouteManager:
@@ -169,8 +563,13 @@ class RouteManager:
     
     NOMINATIM_URL = "https://nominatim.openstreetmap.org"
     OSRM_URL = "https://router.project-osrm.org"
+    EARTH_RADIUS_KM = 6371
+    TIMEOUT = (2, 10)  # (connect, read) seconds
+    
+    _session = _http_session()
     
     @classmethod
+    @_ttl_cached(key=lambda address: " ".join(address.split()).lower())
     def geocode_address(cls, address: str) -> Optional[Tuple[float, float]]:
         """
         Convert address to coordinates using Nominatim
@@ -182,25 +581,26 @@ class RouteManager:
             Tuple of (lat, lng) or None if not found
         """
         try:
-            response = requests.get(
+            response = cls._session.get(
                 f"{cls.NOMINATIM_URL}/search",
                 params={
                     "format": "json",
                     "q": address
                 },
-                headers={"User-Agent": "CarSimulator/1.0"}
+                timeout=cls.TIMEOUT
             )
             response.raise_for_status()
-            data = response.json()
+            places = msgspec.json.decode(response.content, type=List[NominatimPlace])
             
-            if data:
-                return (float(data[0]["lat"]), float(data[0]["lon"]))
+            if places:
+                return (float(places[0].lat), float(places[0].lon))
             return None
         except Exception as e:
             print(f"Geocoding error: {e}")
             return None
     
     @classmethod
+    @_ttl_cached(key=_round_coords)
     def reverse_geocode(cls, lat: float, lng: float) -> Optional[str]:
         """
         Convert coordinates to address using Nominatim
@@ -213,24 +613,25 @@ class RouteManager:
             Address string or None if not found
         """
         try:
-            response = requests.get(
+            response = cls._session.get(
                 f"{cls.NOMINATIM_URL}/reverse",
                 params={
                     "format": "json",
                     "lat": lat,
                     "lon": lng
                 },
-                headers={"User-Agent": "CarSimulator/1.0"}
+                timeout=cls.TIMEOUT
             )
             response.raise_for_status()
-            data = response.json()
+            place = msgspec.json.decode(response.content, type=NominatimAddress)
             
-            return data.get("display_name")
+            return place.display_name
         except Exception as e:
             print(f"Reverse geocoding error: {e}")
             return None
     
     @classmethod
+    @_ttl_cached(key=_round_coords)
     def calculate_route(
         cls, 
         start_lat: float, 
@@ -249,34 +650,45 @@ class RouteManager:
             Route data including geometry, distance, and duration
         """
         try:
-            response = requests.get(
+            response = cls._session.get(
                 f"{cls.OSRM_URL}/route/v1/driving/{start_lng},{start_lat};{end_lng},{end_lat}",
                 params={
                     "overview": "full",
                     "geometries": "geojson",
                     "steps": "true"
-                }
+                },
+                timeout=cls.TIMEOUT
             )
             response.raise_for_status()
-            data = response.json()
+            data = msgspec.json.decode(response.content, type=OSRMResponse)
             
-            if data.get("routes"):
-                route = data["routes"][0]
+            if data.routes:
+                route = data.routes[0]
+                
+                # OSRM returns [lng, lat]; flip the columns in one strided copy
+                coords = np.asarray(
+                    route.geometry.coordinates, dtype=np.float64
+                ).reshape(-1, 2)
+                coords = coords[:, ::-1].copy()
+                bearings = cls.route_bearings(coords)
+                
+                # The result is cached and shared, so freeze its arrays
+                coords.setflags(write=False)
+                bearings.setflags(write=False)
+                
                 return {
-                    "coordinates": [
-                        [coord[1], coord[0]] 
-                        for coord in route["geometry"]["coordinates"]
-                    ],
-                    "distance": route["distance"],  # meters
-                    "duration": route["duration"],  # seconds
+                    "coordinates": coords,
+                    "bearings": bearings,
+                    "distance": route.distance,  # meters
+                    "duration": route.duration,  # seconds
                     "steps": [
                         {
-                            "instruction": step.get("maneuver", {}).get("instruction", ""),
-                            "distance": step.get("distance", 0),
-                            "duration": step.get("duration", 0)
+                            "instruction": step.maneuver.instruction,
+                            "distance": step.distance,
+                            "duration": step.duration
                         }
-                        for leg in route.get("legs", [])
-                        for step in leg.get("steps", [])
+                        for leg in route.legs
+                        for step in leg.steps
                     ]
                 }
             return None
@@ -284,6 +696,30 @@ class RouteManager:
             print(f"Routing error: {e}")
             return None
     
+    @classmethod
+    def route_bearings(cls, coords: np.ndarray) -> np.ndarray:
+        """
+        Calculate the initial bearing of every segment along a route
+        
+        Args:
+            coords: (N, 2) array of [lat, lng] points
+            
+        Returns:
+            Array of N-1 bearings in degrees (0 = North, clockwise)
+        """
+        lat = np.radians(coords[:, 0])
+        d_lng = np.radians(np.diff(coords[:, 1]))
+        
+        # Each point ends one segment and starts the next, so its sin/cos
+        # are computed once and shared by both
+        sin_lat = np.sin(lat)
+        cos_lat = np.cos(lat)
+        
+        y = np.sin(d_lng) * cos_lat[1:]
+        x = cos_lat[:-1] * sin_lat[1:] - sin_lat[:-1] * cos_lat[1:] * np.cos(d_lng)
+        
+        return np.degrees(np.arctan2(y, x)) % 360
+    
     @classmethod
     def calculate_distance(
         cls, 
@@ -302,91 +738,200 @@ class RouteManager:
         Returns:
             Distance in kilometers
         """
-        R = 6371  # Earth's radius in km
-        
         d_lat = math.radians(lat2 - lat1)
         d_lon = math.radians(lon2 - lon1)
         
-        a = (math.sin(d_lat/2) ** 2 + 
+        sin_dlat = math.sin(d_lat * 0.5)
+        sin_dlon = math.sin(d_lon * 0.5)
+        a = (sin_dlat * sin_dlat + 
              math.cos(math.radians(lat1)) * 
              math.cos(math.radians(lat2)) * 
-             math.sin(d_lon/2) ** 2)
+             sin_dlon * sin_dlon)
         
         c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
         
-        return R * c
+        return cls.EARTH_RADIUS_KM * c
+    
+    @classmethod
+    def calculate_distance_batch(
+        cls,
+        lat1: Any,
+        lon1: Any,
+        lat2: Any,
+        lon2: Any
+    ) -> np.ndarray:
+        """
+        Calculate pairwise distances using a vectorized Haversine formula
+        
+        Args:
+            lat1, lon1: Array-likes of first point coordinates
+            lat2, lon2: Array-likes of second point coordinates
+            
+        Returns:
+            Array of distances in kilometers
+        """
+        lat1 = np.asarray(lat1, dtype=np.float64)
+        lon1 = np.asarray(lon1, dtype=np.float64)
+        lat2 = np.asarray(lat2, dtype=np.float64)
+        lon2 = np.asarray(lon2, dtype=np.float64)
+        
+        a = np.sin(np.radians(lat2 - lat1) * 0.5)
+        a *= a
+        h = np.sin(np.radians(lon2 - lon1) * 0.5)
+        h *= h
+        h *= np.cos(np.radians(lat1))
+        h *= np.cos(np.radians(lat2))
+        a += h
+        
+        # arcsin form avoids the atan2 of the scalar version
+        return 2 * cls.EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+# Global state storage, sharded by session id so requests only contend
+# with other sessions that hash to the same table
+NSHARDS = 16  # power of two
+_shards = [SessionTable() for _ in range(NSHARDS)]
+
+
+def _shard(session_id: str) -> SessionTable:
+    """Return the SessionTable that owns a session"""
+    return _shards[hash(session_id) & (NSHARDS - 1)]
+
+# Physics tick rate of the background integrator
+TICK_RATE = 60  # Hz
+TICK_NS = 1_000_000_000 // TICK_RATE
 
 
-# Global state storage
-car_states: Dict[str, CarState] = {}
-last_update_time: Dict[str, float] = {}
+def _physics_ticker() -> None:
+    """Step every session at a fixed TICK_RATE, independently of HTTP traffic"""
+    last_tick_ns = time.monotonic_ns()
+    while True:
+        now_ns = time.monotonic_ns()
+
+        # Limit delta time to prevent huge jumps
+        delta_time = min((now_ns - last_tick_ns) * 1e-9, 0.1)
+        last_tick_ns = now_ns
+
+        # One failing shard must not stop physics for every session
+        for table in _shards:
+            try:
+                table.step(delta_time)
+            except Exception as e:
+                print(f"Physics tick error: {e}")
+
+        # Sleep only for what is left of the tick so stepping doesn't drift
+        elapsed_ns = time.monotonic_ns() - now_ns
+        time.sleep(max(0, TICK_NS - elapsed_ns) * 1e-9)
+
+
+_ticker: Optional[threading.Thread] = None
+_ticker_lock = threading.Lock()
+
+
+def start_physics_ticker() -> None:
+    """
+    Warm up the kernel and start the physics ticker, once per process
+
+    Called from the gunicorn post_worker_init hook and the __main__ block
+    rather than at import, so the ticker runs in the process that serves
+    requests (not in a --preload master or a script importing this module).
+    """
+    global _ticker
+    with _ticker_lock:
+        if _ticker is not None:
+            return
+        _warm_up_kernel()
+        _ticker = threading.Thread(
+            target=_physics_ticker, name="physics-ticker", daemon=True
+        )
+        _ticker.start()
+
+
+@dataclass(slots=True)
+class LatLng:
+    """A lat/lng pair in a reply"""
+    lat: float
+    lng: float
+
+
+@dataclass(slots=True)
+class UpdateReply:
+    """Shape of the /update reply; orjson serializes it without a dict"""
+    success: bool
+    position: LatLng
+    heading: float
+    speed: float
+    rpm: float
+
+    @classmethod
+    def from_state(cls, state: CarState) -> 'UpdateReply':
+        """Build the reply for a session's CarState"""
+        return cls(
+            True, LatLng(state.lat, state.lng),
+            state.heading, state.speed, state.rpm
+        )
 
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({"status": "healthy", "service": "car-simulator-backend"})
+    return ojson({"status": "healthy", "service": "car-simulator-backend"})
 
 
 @app.route('/update', methods=['POST'])
 def update_car_state():
     """
-    Update car state with physics calculations
+    Update driver inputs for the physics ticker
     
-    Expects JSON body with car state data
-    Returns updated position and state
+    Expects JSON body with car state data; position, heading and speed
+    only place a new session, or relocate one whose posted position
+    differs from the stored one
+    Returns the session's current position and state
     """
     try:
-        data = request.get_json()
-        session_id = data.get('session_id', 'default')
-        
-        # Get or create car state
-        if session_id not in car_states:
-            car_states[session_id] = CarState()
-            last_update_time[session_id] = time.time()
-        
-        state = car_states[session_id]
-        
-        # Update state from request
-        if 'position' in data:
-            state.lat = data['position'].get('lat', state.lat)
-            state.lng = data['position'].get('lng', state.lng)
-        state.heading = data.get('heading', state.heading)
-        state.speed = data.get('speed', state.speed)
-        state.gear = data.get('gear', state.gear)
-        state.engine_on = data.get('engineOn', state.engine_on)
-        state.steering_angle = data.get('steeringAngle', state.steering_angle)
-        state.clutch = data.get('clutch', state.clutch)
-        state.brake = data.get('brake', state.brake)
-        state.accelerator = data.get('accelerator', state.accelerator)
-        
-        # Calculate delta time
-        current_time = time.time()
-        delta_time = current_time - last_update_time[session_id]
-        last_update_time[session_id] = current_time
-        
-        # Limit delta time to prevent huge jumps
-        delta_time = min(delta_time, 0.1)
-        
-        # Update physics
-        state = PhysicsEngine.update_physics(state, delta_time)
-        state = PhysicsEngine.update_position(state, delta_time)
+        msg = parse_body(UpdateMsg)
+        session_id = msg.session_id
         
-        car_states[session_id] = state
+        table = _shard(session_id)
+        with table.lock:
+            state = table.read(session_id)
+            placed = state is None
+            if placed:
+                state = CarState()
+            
+            # Put the car where the client says it is
+            if msg.position is not None:
+                if msg.position.lat is not None and msg.position.lat != state.lat:
+                    state.lat = msg.position.lat
+                    placed = True
+                if msg.position.lng is not None and msg.position.lng != state.lng:
+                    state.lng = msg.position.lng
+                    placed = True
+            
+            if placed:
+                for field in SEED_FIELDS:
+                    value = getattr(msg, field)
+                    if value is not None:
+                        setattr(state, field, value)
+            
+            # Update driver inputs from request
+            for field in INPUT_FIELDS:
+                value = getattr(msg, field)
+                if value is not None:
+                    setattr(state, field, value)
+            
+            # A stopped engine has no RPM; the ticker skips parked rows so
+            # it would not zero it later
+            if not state.engine_on:
+                state.rpm = 0.0
+            
+            # Physics is integrated by the ticker
+            table.write(session_id, state)
         
-        return jsonify({
-            "success": True,
-            "position": {
-                "lat": state.lat,
-                "lng": state.lng
-            },
-            "heading": state.heading,
-            "speed": state.speed,
-            "rpm": state.rpm
-        })
+        return ojson(UpdateReply.from_state(state))
         
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 400
+        return ojson({"success": False, "error": str(e)}, 400)
 
 
 @app.route('/geocode', methods=['POST'])
@@ -398,28 +943,27 @@ def geocode():
     Returns coordinates if found
     """
     try:
-        data = request.get_json()
-        address = data.get('address', '')
+        address = parse_body(GeocodeMsg).address
         
         if not address:
-            return jsonify({"success": False, "error": "Address required"}), 400
+            return ojson({"success": False, "error": "Address required"}, 400)
         
         coords = RouteManager.geocode_address(address)
         
         if coords:
-            return jsonify({
+            return ojson({
                 "success": True,
                 "lat": coords[0],
                 "lng": coords[1]
             })
         else:
-            return jsonify({
+            return ojson({
                 "success": False,
                 "error": "Address not found"
-            }), 404
+            }, 404)
             
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 400
+        return ojson({"success": False, "error": str(e)}, 400)
 
 
 @app.route('/reverse-geocode', methods=['POST'])
@@ -431,31 +975,31 @@ def reverse_geocode():
     Returns address if found
     """
     try:
-        data = request.get_json()
-        lat = data.get('lat')
-        lng = data.get('lng')
+        msg = parse_body(ReverseGeocodeMsg)
+        lat = msg.lat
+        lng = msg.lng
         
         if lat is None or lng is None:
-            return jsonify({
+            return ojson({
                 "success": False, 
                 "error": "Latitude and longitude required"
-            }), 400
+            }, 400)
         
         address = RouteManager.reverse_geocode(lat, lng)
         
         if address:
-            return jsonify({
+            return ojson({
                 "success": True,
                 "address": address
             })
         else:
-            return jsonify({
+            return ojson({
                 "success": False,
                 "error": "Location not found"
-            }), 404
+            }, 404)
             
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 400
+        return ojson({"success": False, "error": str(e)}, 400)
 
 
 @app.route('/route', methods=['POST'])
@@ -467,38 +1011,35 @@ def calculate_route():
     Returns route geometry, distance, and duration
     """
     try:
-        data = request.get_json()
+        msg = parse_body(RouteMsg)
         
-        start = data.get('start', {})
-        end = data.get('end', {})
+        start = msg.start
+        end = msg.end
         
-        if not all([
-            start.get('lat'), start.get('lng'),
-            end.get('lat'), end.get('lng')
-        ]):
-            return jsonify({
+        if not all([start.lat, start.lng, end.lat, end.lng]):
+            return ojson({
                 "success": False,
                 "error": "Start and end coordinates required"
-            }), 400
+            }, 400)
         
         route = RouteManager.calculate_route(
-            start['lat'], start['lng'],
-            end['lat'], end['lng']
+            start.lat, start.lng,
+            end.lat, end.lng
         )
         
         if route:
-            return jsonify({
+            return ojson({
                 "success": True,
                 "route": route
             })
         else:
-            return jsonify({
+            return ojson({
                 "success": False,
                 "error": "Could not calculate route"
-            }), 404
+            }, 404)
             
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 400
+        return ojson({"success": False, "error": str(e)}, 400)
 
 
 @app.route('/distance', methods=['POST'])
@@ -510,34 +1051,71 @@ def calculate_distance():
     Returns distance in kilometers
     """
     try:
-        data = request.get_json()
+        msg = parse_body(DistanceMsg)
         
-        from_point = data.get('from', {})
-        to_point = data.get('to', {})
+        from_point = msg.from_point
+        to_point = msg.to_point
         
-        if not all([
-            from_point.get('lat'), from_point.get('lng'),
-            to_point.get('lat'), to_point.get('lng')
-        ]):
-            return jsonify({
+        if not all([from_point.lat, from_point.lng, to_point.lat, to_point.lng]):
+            return ojson({
                 "success": False,
                 "error": "From and to coordinates required"
-            }), 400
+            }, 400)
         
         distance = RouteManager.calculate_distance(
-            from_point['lat'], from_point['lng'],
-            to_point['lat'], to_point['lng']
+            from_point.lat, from_point.lng,
+            to_point.lat, to_point.lng
         )
         
-        return jsonify({
+        return ojson({
             "success": True,
             "distance_km": distance
         })
         
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 400
+        return ojson({"success": False, "error": str(e)}, 400)
 
 
+@app.route('/distance/batch', methods=['POST'])
+def calculate_distance_batch():
+    """
+    Calculate distances between many pairs of points
+    
+    Expects JSON body with 'from' and 'to' objects containing parallel
+    'lat' and 'lng' arrays
+    Returns distances in kilometers, one per pair
+    """
+    try:
+        msg = parse_body(DistanceBatchMsg)
+        
+        from_points = msg.from_points
+        to_points = msg.to_points
+        columns = [from_points.lat, from_points.lng, to_points.lat, to_points.lng]
+        
+        if any(col is None for col in columns):
+            return ojson({
+                "success": False,
+                "error": "From and to coordinate arrays required"
+            }, 400)
+        
+        if len({len(col) for col in columns}) != 1:
+            return ojson({
+                "success": False,
+                "error": "Coordinate arrays must have the same length"
+            }, 400)
+        
+        distances = RouteManager.calculate_distance_batch(*columns)
+        
+        return ojson({
+            "success": True,
+            "distances_km": distances
+        })
+        
+    except Exception as e:
+        return ojson({"success": False, "error": str(e)}, 400)
+
+
+@app.route('/state', methods=['GET'], defaults={'session_id': 'default'})
 @app.route('/state/<session_id>', methods=['GET'])
 def get_state(session_id: str):
     """
@@ -545,9 +1123,9 @@ def get_state(session_id: str):
     
     Returns the current state or 404 if session not found
     """
-    if session_id in car_states:
-        state = car_states[session_id]
-        return jsonify({
+    state = _shard(session_id).read(session_id)
+    if state is not None:
+        return ojson({
             "success": True,
             "state": {
                 "position": {"lat": state.lat, "lng": state.lng},
@@ -559,10 +1137,10 @@ def get_state(session_id: str):
             }
         })
     else:
-        return jsonify({
+        return ojson({
             "success": False,
             "error": "Session not found"
-        }), 404
+        }, 404)
 
 
 @app.route('/reset', methods=['POST'])
@@ -573,26 +1151,24 @@ def reset_state():
     Optionally accepts a session_id in the request body
     """
     try:
-        data = request.get_json() or {}
-        session_id = data.get('session_id', 'default')
+        msg = parse_body(ResetMsg, default_empty=True)
+        session_id = msg.session_id
         
         # Reset to default position or specified position
-        initial_lat = data.get('lat', 12.9716)
-        initial_lng = data.get('lng', 77.5946)
-        
-        car_states[session_id] = CarState(lat=initial_lat, lng=initial_lng)
-        last_update_time[session_id] = time.time()
+        _shard(session_id).write(session_id, CarState(lat=msg.lat, lng=msg.lng))
         
-        return jsonify({
+        return ojson({
             "success": True,
             "message": "State reset successfully"
         })
         
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 400
+        return ojson({"success": False, "error": str(e)}, 400)
 
 
 if __name__ == '__main__':
+    # Development only; production runs under gunicorn (see gunicorn.conf.py)
     print("Starting Car Simulator Backend Server...")
     print("Server running on http://localhost:5000")
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    start_physics_ticker()
+    app.run(host='0.0.0.0', port=5000, threaded=True)